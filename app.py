@@ -1,12 +1,176 @@
+import hashlib
+import os
+import sqlite3
+import time
+import pandas as pd
 import streamlit as st
-import requests
-from typing import Dict, Any, Optional, Tuple, List
+import httpx
+import orjson
+from diskcache import Cache
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional, Tuple, List, Callable, Iterable
 
 st.set_page_config(page_title="Cloudflare DNS 面板", layout="wide")
 
 CF_API_BASE = "https://api.cloudflare.com/client/v4"
 DNS_TYPES = ["A", "AAAA", "CNAME", "TXT", "MX", "NS", "SRV", "CAA"]
 TTL_OPTIONS = [1, 60, 120, 300, 600, 1800, 3600, 7200, 86400]
+MAX_WORKERS = 8
+PAGE_CSS = """
+<style>
+  .block-container { padding-top: 1.2rem; }
+  [data-testid="stSidebar"] { min-width: 320px; max-width: 320px; }
+</style>
+"""
+ZONES_TTL = 60
+DNS_TTL = 15
+CACHE_MAX_STALE = 3600
+ZONES_DISK_TTL = 6 * 3600
+DISK_CACHE_DIR = os.path.expanduser("~/.cache/cfdns")
+ZONES_DISK_PREFIX = "zones:v2:"
+RETRY_STATUS = {429, 502, 503, 504}
+RETRY_TIMES = 3
+# 空闲连接默认 5 秒就关，页面上两次点击间隔往往更长；保持 60 秒，DNS 解析 + TLS 握手每个空闲窗口最多一次
+CF_LIMITS = httpx.Limits(max_connections=20, max_keepalive_connections=10, keepalive_expiry=60.0)
+CF_TIMEOUT = httpx.Timeout(20.0, connect=5.0)
+
+
+@st.cache_resource
+def get_client() -> httpx.Client:
+    # 进程内共享同一个 HTTP/2 Client（Streamlit 每次交互都会重跑脚本），并发请求在同一条 TLS 连接上多路复用
+    transport = httpx.HTTPTransport(http2=True, retries=RETRY_TIMES, limits=CF_LIMITS)  # 只重试建连失败
+    return httpx.Client(transport=transport, timeout=CF_TIMEOUT)
+
+
+_CLIENT = get_client()
+
+
+@st.cache_resource
+def get_cache_store() -> Dict[Tuple[str, str], Tuple[float, Any]]:
+    # 进程级缓存：跨会话/浏览器标签共享，重跑脚本不会丢；key = (token 哈希, 资源名)
+    return {}
+
+
+_CACHE = get_cache_store()
+
+
+@st.cache_resource
+def get_disk_cache() -> Optional[Cache]:
+    # 磁盘缓存（只放 zones 列表）：服务重启、新开标签页后也不用重新拉取；目录不可写时返回 None，只用内存缓存
+    try:
+        cache = Cache(DISK_CACHE_DIR)
+        cache.expire()  # 启动时清掉已过期的条目
+        # 旧版本存的是没有过期时间的 (时间戳, zones)，格式不同，直接删掉
+        for key in list(cache.iterkeys()):
+            if isinstance(key, str) and key.startswith("zones:") and not key.startswith(ZONES_DISK_PREFIX):
+                cache.delete(key)
+    except (OSError, sqlite3.Error):
+        return None
+    return cache
+
+
+_DC = get_disk_cache()
+
+
+def disk_get(key: str) -> Any:
+    if _DC is None:
+        return None
+    try:
+        return _DC.get(key)
+    except (OSError, sqlite3.Error):
+        return None
+
+
+def disk_set(key: str, value: Any, expire: float):
+    if _DC is None:
+        return
+    try:
+        _DC.set(key, value, expire=expire)
+    except (OSError, sqlite3.Error):
+        pass
+
+
+def disk_delete(key: str):
+    if _DC is None:
+        return
+    try:
+        _DC.delete(key)
+    except (OSError, sqlite3.Error):
+        pass
+
+
+def token_key(token: str) -> str:
+    # 只用 token 的哈希做缓存 key，不在内存里按明文保存 token
+    return hashlib.sha256(token.strip().encode()).hexdigest()[:16]
+
+
+def zones_disk_key(tk: str) -> str:
+    return ZONES_DISK_PREFIX + tk
+
+
+def cache_get(key: Tuple[str, str], ttl: float) -> Optional[Any]:
+    hit = _CACHE.get(key)
+    if hit is None or time.time() - hit[0] > ttl:
+        return None
+    return hit[1]
+
+
+def cache_set(key: Tuple[str, str], value: Any):
+    now = time.time()
+    # 顺手清掉超过兜底期限的旧条目，避免看过的每个 (token, zone) 一直留在内存里
+    for k, (ts, _) in list(_CACHE.items()):
+        if now - ts > CACHE_MAX_STALE:
+            _CACHE.pop(k, None)
+    _CACHE[key] = (now, value)
+
+
+def cache_pop(key: Tuple[str, str]):
+    _CACHE.pop(key, None)
+
+
+def cache_clear_token(token: str):
+    cache_clear_token_key(token_key(token))
+
+
+def cache_clear_token_key(tk: str):
+    for key in [k for k in list(_CACHE) if k[0] == tk]:
+        _CACHE.pop(key, None)
+    disk_delete(zones_disk_key(tk))
+
+
+def cached_fetch(key: Tuple[str, str], ttl: float, fetch: Callable[[], Any]) -> Any:
+    value = cache_get(key, ttl)
+    if value is not None:
+        return value
+    try:
+        value = fetch()
+    except Exception as e:
+        # 只有网络错误 / 429 / 5xx 才用旧数据顶上；401/403 等说明 token 失效或权限变了，
+        # 这个 token 的所有缓存（包括磁盘上的 zones）都不能再给
+        if isinstance(e, CFError) and not is_transient(e):
+            cache_clear_token_key(key[0])
+            raise
+        if not is_transient(e):
+            cache_pop(key)
+            raise
+        stale = cache_get(key, CACHE_MAX_STALE)
+        if stale is None:
+            raise
+        st.warning("Cloudflare 请求失败，当前显示的是缓存数据，可能不是最新")
+        return stale
+    cache_set(key, value)
+    return value
+
+
+class CFError(RuntimeError):
+    # 带上 HTTP 状态码（0 = 没拿到响应），用来区分临时故障和鉴权/参数错误
+    def __init__(self, message: str, status: int):
+        super().__init__(message)
+        self.status = status
+
+
+def is_transient(e: Exception) -> bool:
+    return isinstance(e, CFError) and (e.status == 0 or e.status == 429 or e.status >= 500)
 
 
 def cf_headers(token: str) -> Dict[str, str]:
@@ -14,9 +178,32 @@ def cf_headers(token: str) -> Dict[str, str]:
 
 
 def extract_error(data: Any) -> str:
-    if isinstance(data, dict) and data.get("errors"):
-        return "；".join(f"[{e.get('code')}] {e.get('message')}" for e in data["errors"])
-    return str(data.get("message", "未知错误")) if isinstance(data, dict) else "未知错误"
+    if not isinstance(data, dict):
+        return "未知错误"
+    errors = data.get("errors")
+    if not errors:
+        return str(data.get("message", "未知错误"))
+    return "；".join([f"[{e.get('code')}] {e.get('message')}" for e in errors])
+
+
+def parse_json(r: httpx.Response) -> Any:
+    # DNS 记录列表响应可能很大，用 orjson 解析更快；解不了（比如非 UTF-8）再交给 httpx 自己处理
+    try:
+        return orjson.loads(r.content)
+    except orjson.JSONDecodeError:
+        return r.json()
+
+
+def should_retry(method: str, r: httpx.Response, attempt: int) -> bool:
+    # 429/5xx 退避重试；POST 不是幂等的，不重试
+    return r.status_code in RETRY_STATUS and method != "POST" and attempt < RETRY_TIMES
+
+
+def check_response(r: httpx.Response, data: Dict[str, Any]) -> Tuple[bool, Dict[str, Any], str, int]:
+    if not r.is_success or data.get("success") is False:
+        return False, data, extract_error(data), r.status_code
+
+    return True, data, "", r.status_code
 
 
 def cf_request(
@@ -25,86 +212,162 @@ def cf_request(
     token: str,
     params: Optional[Dict[str, Any]] = None,
     json: Optional[Dict[str, Any]] = None,
-) -> Tuple[bool, Dict[str, Any], str]:
+) -> Tuple[bool, Dict[str, Any], str, int]:
+    r = None
     try:
-        r = requests.request(
-            method,
-            CF_API_BASE + path,
-            headers=cf_headers(token),
-            params=params,
-            json=json,
-            timeout=20,
-        )
-        data = r.json()
+        for attempt in range(RETRY_TIMES + 1):
+            r = _CLIENT.request(method, CF_API_BASE + path, headers=cf_headers(token), params=params, json=json)
+            if not should_retry(method, r, attempt):
+                break
+            time.sleep(0.3 * 2**attempt)
+        data = parse_json(r)
     except Exception as e:
-        return False, {}, f"请求失败：{e}"
+        return False, {}, f"请求失败：{e}", r.status_code if r is not None else 0
+
+    return check_response(r, data)
+
+
+def page_items(res: Tuple[bool, Dict[str, Any], str, int]) -> Tuple[List[Dict[str, Any]], int]:
+    ok, data, err, status = res
+    if not ok:
+        raise CFError(err, status)
+    return data.get("result", []), data.get("result_info", {}).get("total_pages", 1)
+
+
+def merge_pages(items: List[Dict[str, Any]], pages: Iterable[Tuple[bool, Dict[str, Any], str, int]]) -> List[Dict[str, Any]]:
+    # pages 按页码顺序给出，保证结果顺序与串行翻页一致
+    items = list(items)
+    for res in pages:
+        items.extend(page_items(res)[0])
+    return items
 
-    if not r.ok or data.get("success") is False:
-        return False, data, extract_error(data)
 
-    return True, data, ""
+# 先取第 1 页拿到 total_pages，其余页并发拉取（共享同一个 HTTP/2 连接，最多 MAX_WORKERS 个同时在途）
+def cf_get_all(path: str, token: str, per_page: int, params: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+    base = dict(params or {}, per_page=per_page)
+    items, total_pages = page_items(cf_request("GET", path, token, params=dict(base, page=1)))
+    if total_pages <= 1:
+        return list(items)
+
+    with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, total_pages - 1)) as ex:
+        pages = ex.map(lambda p: cf_request("GET", path, token, dict(base, page=p)), range(2, total_pages + 1))
+        return merge_pages(items, pages)
 
 
 def ttl_label(v: int) -> str:
     return "自动" if v == 1 else f"{v} 秒"
 
 
-@st.cache_data(ttl=60)
-def get_zones_cached(token: str) -> List[Dict[str, Any]]:
-    zones = []
-    page = 1
-    while True:
-        ok, data, err = cf_request("GET", "/zones", token, params={"page": page, "per_page": 50})
-        if not ok:
-            raise RuntimeError(err)
-        zones.extend(data.get("result", []))
-        if page >= data.get("result_info", {}).get("total_pages", 1):
-            break
-        page += 1
+def zones_cache_key(token: str) -> Tuple[str, str]:
+    return token_key(token), "zones"
+
+
+def dns_cache_key(token: str, zone_id: str) -> Tuple[str, str]:
+    return token_key(token), zone_id
+
+
+def save_zones(token: str, zones: List[Dict[str, Any]]):
+    cache_set(zones_cache_key(token), zones)
+    disk_set(zones_disk_key(token_key(token)), zones, ZONES_DISK_TTL)
+
+
+def drop_zones(token: str):
+    cache_pop(zones_cache_key(token))
+    disk_delete(zones_disk_key(token_key(token)))
+
+
+def _load_zones(token: str) -> List[Dict[str, Any]]:
+    # 磁盘条目 6 小时后由 diskcache 自动过期；拉取失败的兜底统一交给 cached_fetch
+    zones = disk_get(zones_disk_key(token_key(token)))
+    if isinstance(zones, list):
+        return zones
+    # /zones 的 per_page 上限就是 50
+    zones = cf_get_all("/zones", token, per_page=50)
+    disk_set(zones_disk_key(token_key(token)), zones, ZONES_DISK_TTL)
     return zones
 
 
+def get_zones_cached(token: str) -> List[Dict[str, Any]]:
+    return cached_fetch(zones_cache_key(token), ZONES_TTL, lambda: _load_zones(token))
+
+
+def invalidate_dns(token: str, zone_id: str):
+    cache_pop(dns_cache_key(token, zone_id))
+
+
 def list_dns(token: str, zone_id: str) -> List[Dict[str, Any]]:
-    ok, data, err = cf_request(
-        "GET",
-        f"/zones/{zone_id}/dns_records",
-        token,
-        params={"page": 1, "per_page": 100},
+    # 超过 100 条时继续翻页，不再只显示第 1 页
+    return cached_fetch(
+        dns_cache_key(token, zone_id),
+        DNS_TTL,
+        lambda: cf_get_all(f"/zones/{zone_id}/dns_records", token, per_page=100),
     )
-    if not ok:
-        raise RuntimeError(err)
-    return data.get("result", [])
 
 
+# 刷新按钮：zones 和当前 zone 的 DNS 记录一起并发重新拉取，成功后写回缓存
+def refresh_all(token: str, zone_id: str):
+    with ThreadPoolExecutor(max_workers=2) as ex:
+        zones_f = ex.submit(cf_get_all, "/zones", token, 50)
+        records_f = ex.submit(cf_get_all, f"/zones/{zone_id}/dns_records", token, 100)
+        zones, records = zones_f.result(), records_f.result()
+    save_zones(token, zones)
+    cache_set(dns_cache_key(token, zone_id), records)
+
+
+def dns_search_index(token: str, zone_id: str, records: List[Dict[str, Any]]) -> List[Tuple[Dict[str, Any], str, str]]:
+    # 预先把 name/content 转小写，同一批记录只建一次；list_dns 重新拉取后（列表对象变了）才重建
+    key = (token_key(token), f"{zone_id}:search")
+    hit = _CACHE.get(key)
+    if hit is not None and hit[1][0] is records:
+        return hit[1][1]
+    index = [(r, (r.get("name") or "").lower(), (r.get("content") or "").lower()) for r in records]
+    cache_set(key, (records, index))
+    return index
+
+
+# 只在 batch_apply_dns 里并发调用，缓存由它统一失效一次
 def update_dns(token: str, zone_id: str, record_id: str, payload: Dict[str, Any]):
-    ok, _, err = cf_request("PUT", f"/zones/{zone_id}/dns_records/{record_id}", token, json=payload)
+    ok, _, err, status = cf_request("PUT", f"/zones/{zone_id}/dns_records/{record_id}", token, json=payload)
     if not ok:
-        raise RuntimeError(err)
+        raise CFError(err, status)
 
 
 def delete_dns(token: str, zone_id: str, record_id: str):
-    ok, _, err = cf_request("DELETE", f"/zones/{zone_id}/dns_records/{record_id}", token)
+    ok, _, err, status = cf_request("DELETE", f"/zones/{zone_id}/dns_records/{record_id}", token)
     if not ok:
-        raise RuntimeError(err)
+        raise CFError(err, status)
+
+
+# 「应用修改」时把所有保存/删除并发提交（共享同一个 HTTP/2 连接），返回失败列表 (操作, record_id, 错误)
+def batch_apply_dns(
+    token: str, zone_id: str, updates: List[Tuple[str, Dict[str, Any]]], deletes: List[str]
+) -> List[Tuple[str, str, str]]:
+    failures = []
+    if not (updates or deletes):
+        return failures
+    with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(updates) + len(deletes))) as ex:
+        futures = {ex.submit(update_dns, token, zone_id, rid, payload): ("保存", rid) for rid, payload in updates}
+        futures.update({ex.submit(delete_dns, token, zone_id, rid): ("删除", rid) for rid in deletes})
+        for f, (action, rid) in futures.items():
+            try:
+                f.result()
+            except Exception as e:
+                failures.append((action, rid, str(e)))
+    invalidate_dns(token, zone_id)
+    return failures
 
 
 def create_dns(token: str, zone_id: str, payload: Dict[str, Any]):
-    ok, _, err = cf_request("POST", f"/zones/{zone_id}/dns_records", token, json=payload)
+    ok, _, err, status = cf_request("POST", f"/zones/{zone_id}/dns_records", token, json=payload)
+    invalidate_dns(token, zone_id)
     if not ok:
-        raise RuntimeError(err)
+        raise CFError(err, status)
 
 
 # ---------------- UI ----------------
 
-st.markdown(
-    """
-    <style>
-      .block-container { padding-top: 1.2rem; }
-      [data-testid="stSidebar"] { min-width: 320px; max-width: 320px; }
-    </style>
-    """,
-    unsafe_allow_html=True,
-)
+# 每次重跑都要输出：Streamlit 会清掉本轮没有再输出的元素，只在首次注入的话样式会在下一次交互后消失
+st.markdown(PAGE_CSS, unsafe_allow_html=True)
 
 st.title("☁️ Cloudflare DNS 面板")
 
@@ -112,19 +375,20 @@ st.title("☁️ Cloudflare DNS 面板")
 with st.sidebar:
     st.header("🔐 认证（不保存）")
     token_input = st.text_input("Cloudflare API Token", type="password", placeholder="粘贴 Token…")
+    st.caption(f"Token 不会保存；Zone 列表会缓存在服务器磁盘 {DISK_CACHE_DIR}（最多 6 小时），点「清除 Token」即删除")
 
     cA, cB = st.columns(2)
     with cA:
         if st.button("使用 Token", use_container_width=True):
             if token_input.strip():
+                # 缓存按 token 哈希区分，换 token 不会串数据；这里不清缓存，老用户重新打开也能直接用磁盘里的 zones
                 st.session_state["cf_token"] = token_input.strip()
-                # 清掉缓存，避免 token 换了 zones 还用旧缓存
-                get_zones_cached.clear()
     with cB:
         if st.button("清除 Token", use_container_width=True):
+            if st.session_state.get("cf_token"):
+                cache_clear_token(st.session_state["cf_token"])
             st.session_state.pop("cf_token", None)
             st.session_state.pop("zones", None)
-            get_zones_cached.clear()
             st.success("已清除（不会保存）")
 
 token = st.session_state.get("cf_token")
@@ -132,6 +396,11 @@ if not token:
     st.info("请在左侧输入 Token → 点击「使用 Token」")
     st.stop()
 
+with st.sidebar:
+    if st.button("🔄 刷新 Zones", use_container_width=True):
+        drop_zones(token)
+        st.rerun()
+
 
 
 # zones
@@ -186,7 +455,11 @@ with colL:
     ctrl1, ctrl2, ctrl3 = st.columns([1, 1, 2])
     with ctrl1:
         if st.button("🔄 刷新", use_container_width=True):
-            st.rerun()
+            try:
+                refresh_all(token, zone_id)
+                st.rerun()
+            except Exception as e:
+                st.error(f"刷新失败：{e}")
     with ctrl2:
         only_proxied = st.toggle("仅显示代理", value=False)
     with ctrl3:
@@ -199,15 +472,11 @@ with colL:
         st.stop()
 
     # 过滤
-    if only_proxied:
-        records = [r for r in records if r.get("proxied")]
     if keyword.strip():
         k = keyword.strip().lower()
-        records = [
-            r
-            for r in records
-            if k in str(r.get("name", "")).lower() or k in str(r.get("content", "")).lower()
-        ]
+        records = [r for r, n, c in dns_search_index(token, zone_id, records) if k in n or k in c]
+    if only_proxied:
+        records = [r for r in records if r.get("proxied")]
 
     st.caption(f"共 {len(records)} 条记录（显示结果）")
 
@@ -215,58 +484,78 @@ with colL:
         st.info("暂无记录或被筛选条件过滤")
         st.stop()
 
-    # 用 expander 分组展示（比全表格更适合 CRUD）
-    for r in records:
-        rid = r["id"]
-        status = "🟠 代理" if r.get("proxied") else "⚪ 仅 DNS"
-        title = f"{status} | {r['type']}  {r['name']}  →  {r.get('content','')}"
-        with st.expander(title, expanded=False):
-            c1, c2, c3, c4 = st.columns([2.2, 2.5, 1.2, 1.3])
-            with c1:
-                name = st.text_input("Name", r["name"], key=f"name_{rid}")
-            with c2:
-                content = st.text_input("Content", r.get("content", ""), key=f"content_{rid}")
-            with c3:
-                ttl = st.selectbox(
-                    "TTL",
-                    TTL_OPTIONS,
-                    format_func=ttl_label,
-                    index=TTL_OPTIONS.index(r["ttl"]) if r.get("ttl") in TTL_OPTIONS else 0,
-                    key=f"ttl_{rid}",
+    # 用一个 data_editor 表格展示全部记录（比每条记录一个 expander 少得多的控件），改完统一「应用修改」
+    df = pd.DataFrame(
+        [
+            {
+                "id": r["id"],
+                "type": r["type"],
+                "name": r["name"],
+                "content": r.get("content", ""),
+                "ttl": r.get("ttl", 1),
+                "proxied": bool(r.get("proxied", False)),
+                "delete": False,
+            }
+            for r in records
+        ]
+    ).set_index("id")
+
+    # 记录里可能有在别处设置的 TTL（不在 TTL_OPTIONS 里），补进下拉选项，否则下拉里没有原值可选
+    ttl_options = TTL_OPTIONS + sorted({int(v) for v in df["ttl"]} - set(TTL_OPTIONS))
+
+    # 筛选条件或数据版本变了就换 key，避免旧的编辑状态按行号套到别的记录上
+    editor_ver = st.session_state.get("editor_ver", 0)
+    edited = st.data_editor(
+        df,
+        column_config={
+            "type": st.column_config.SelectboxColumn("类型", options=DNS_TYPES),
+            "name": st.column_config.TextColumn("Name", required=True),
+            "content": st.column_config.TextColumn("Content"),
+            "ttl": st.column_config.SelectboxColumn("TTL", options=ttl_options, help="1 = 自动"),
+            "proxied": st.column_config.CheckboxColumn("Proxied"),
+            "delete": st.column_config.CheckboxColumn("删除"),
+        },
+        disabled=["type"],
+        hide_index=True,
+        use_container_width=True,
+        num_rows="fixed",
+        key=f"editor_{zone_id}_{keyword.strip()}_{only_proxied}_{editor_ver}",
+    )
+
+    updates: List[Tuple[str, Dict[str, Any]]] = []
+    deletes: List[str] = []
+    for rid, row in edited.iterrows():
+        if row["delete"]:
+            deletes.append(rid)
+            continue
+        orig = df.loc[rid]
+        if any(row[c] != orig[c] for c in ("name", "content", "ttl", "proxied")):
+            updates.append(
+                (
+                    rid,
+                    {
+                        "type": row["type"],
+                        "name": (row["name"] or "").strip(),
+                        "content": (row["content"] or "").strip(),
+                        # DataFrame 里是 numpy 类型，转回内置类型才能 JSON 序列化
+                        "ttl": int(row["ttl"]),
+                        "proxied": bool(row["proxied"]),
+                    },
                 )
-            with c4:
-                proxied = st.checkbox("Proxied", r.get("proxied", False), key=f"px_{rid}")
-
-            b1, b2, b3 = st.columns([1, 1, 1])
-            with b1:
-                if st.button("💾 保存", key=f"save_{rid}", use_container_width=True):
-                    try:
-                        update_dns(
-                            token,
-                            zone_id,
-                            rid,
-                            {
-                                "type": r["type"],
-                                "name": name.strip(),
-                                "content": content.strip(),
-                                "ttl": ttl,
-                                "proxied": proxied,
-                            },
-                        )
-                        st.success("已保存")
-                        st.rerun()
-                    except Exception as e:
-                        st.error(f"保存失败：{e}")
-
-            with b2:
-                confirm = st.checkbox("确认删除", key=f"confirm_{rid}")
-                if st.button("🗑 删除", key=f"del_{rid}", disabled=not confirm, use_container_width=True):
-                    try:
-                        delete_dns(token, zone_id, rid)
-                        st.success("已删除")
-                        st.rerun()
-                    except Exception as e:
-                        st.error(f"删除失败：{e}")
-
-            with b3:
-                st.write("")  # 占位对齐
+            )
+
+    a1, a2 = st.columns([1, 3])
+    with a1:
+        apply_clicked = st.button(
+            "✅ 应用修改", disabled=not (updates or deletes), type="primary", use_container_width=True
+        )
+    with a2:
+        st.caption(f"待保存 {len(updates)} 条，待删除 {len(deletes)} 条")
+
+    if apply_clicked:
+        failures = batch_apply_dns(token, zone_id, updates, deletes)
+        st.session_state["editor_ver"] = editor_ver + 1
+        if failures:
+            st.error("\n\n".join(f"{action} {df.at[rid, 'name']} 失败：{err}" for action, rid, err in failures))
+        else:
+            st.rerun()